@@ -1,21 +1,128 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, StreamingResponse
-from fastapi.staticfiles import StaticFiles
-from pydantic import BaseModel
+from fastapi.responses import RedirectResponse, Response, StreamingResponse
 from gtts import gTTS
+from gtts.tts import gTTSError
+from servestatic import ServeStaticASGI
+from collections import OrderedDict
+import asyncio
+import contextlib
+import functools
+import hashlib
+import hmac
 import io
+import json
+import logging
+import logging.handlers
+import orjson
 import os
+import pathlib
+import queue
+import requests
+import signal
 import socketio
+import sys
+import tempfile
+import threading
+import wave
+
+# --- Logging ---
+# Records are still formatted on the calling thread (QueueHandler.prepare), but the stream
+# write happens on a background thread, so a slow stdout pipe (docker logs, PaaS log drains)
+# never blocks the event loop.
+log = logging.getLogger("bingo")
+log.setLevel(logging.INFO)
+# Don't also hand records to the root logger's handlers, which would write them synchronously
+log.propagate = False
+_log_queue = queue.SimpleQueue()
+log.addHandler(logging.handlers.QueueHandler(_log_queue))
+# Started in `lifespan`
+_log_listener = logging.handlers.QueueListener(_log_queue, logging.StreamHandler())
 
 # --- Configuration ---
 # Hardcoded Secret ID
 HARDCODED_SECRET_ID = "13122025" 
-# Session state flag
-session_started = False 
+# Session state flag (only used when running a single process without Redis)
+session_event = asyncio.Event()
+# Redis for running several workers: shares Socket.IO broadcasts and the session flag between them
+REDIS_URL = os.environ.get("REDIS_URL")
+SESSION_KEY = "bingo:session"
+# An authorized session lapses after this long, like a restart does in single-process mode
+SESSION_TTL = 12 * 60 * 60
+# Local Piper voice model (.onnx). When set, TTS runs on this machine instead of calling Google.
+# Piper (and onnxruntime) is an optional install: pip install -r requirements-piper.txt
+PIPER_VOICE = os.environ.get("PIPER_VOICE")
+# Seconds to wait on Google before giving up on a synthesis
+TTS_TIMEOUT = 10
+# Longest text /tts and /tts_batch will synthesize
+TTS_MAX_CHARS = 200
+# Finished TTS audio and its ETag, keyed by (text, lang), least recently used first.
+# A game only ever says ~100 distinct phrases, so this holds all of them.
+TTS_CACHE_SIZE = 256
+_tts_cache: "OrderedDict[tuple[str, str], tuple[bytes, str]]" = OrderedDict()
+# Synthesized audio is also kept on disk, so restarts and other workers don't ask Google again
+TTS_CACHE_DIR = pathlib.Path(os.environ.get("TTS_CACHE", "./.tts_cache"))
+# Clips kept on disk before the least recently used are evicted; far above a game's vocabulary
+TTS_CACHE_MAX_FILES = int(os.environ.get("TTS_CACHE_MAX_FILES", 2048))
+# Clips on disk as far as this process knows: counted at startup, then bumped on each write.
+# Other workers' writes only show up at the next trim, which recounts.
+_disk_clips = 0
+# TTS syntheses currently running, keyed by (text, lang)
+_inflight: dict[tuple[str, str], "_Synthesis"] = {}
+
+# The Piper voice itself is loaded in `lifespan`
+VOICE = None
+TTS_MEDIA_TYPE = "audio/wav" if PIPER_VOICE else "audio/mpeg"
+
+# The manager only connects on first use, so it's cheap to build here; the session client
+# is created in `lifespan`
+redis = None
+if REDIS_URL:
+    import redis.asyncio as aioredis
+    client_manager = socketio.AsyncRedisManager(REDIS_URL)
+else:
+    client_manager = None
+
+class _OrjsonJSON:
+    """Drop-in for the `json` module, so Socket.IO packets are encoded with orjson."""
+
+    @staticmethod
+    def dumps(obj, **kwargs):
+        # orjson output is already compact, which is what socketio asks for via `separators`
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    loads = staticmethod(orjson.loads)
+
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Per-process setup and teardown.
+
+    Kept out of module scope: uvicorn's workers are spawned processes that import this file
+    twice each, and the supervisor imports it too. Only what runs here happens once per server.
+    """
+    global VOICE, redis
+    _log_listener.start()
+    TTS_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    _trim_disk_cache()
+    # Loading the voice model is the slow part; synthesis is cheap
+    if PIPER_VOICE:
+        from piper import PiperVoice
+        VOICE = PiperVoice.load(PIPER_VOICE)
+    if REDIS_URL:
+        redis = aioredis.from_url(REDIS_URL)
+    _reload_frontend()
+    # Signal handlers can only be set from the main thread (not the case under TestClient)
+    if hasattr(signal, "SIGHUP") and threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGHUP, _reload_frontend)
+    try:
+        yield
+    finally:
+        if redis is not None:
+            await redis.aclose()
+        _log_listener.stop()
 
 # Create FastAPI app
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 # Create Socket.IO server (Async)
 # sio = socketio.AsyncServer(async_mode='asgi', cors_allowed_origins='*')
@@ -23,6 +130,8 @@ app = FastAPI()
 sio = socketio.AsyncServer(
     async_mode='asgi', 
     cors_allowed_origins='*',
+    client_manager=client_manager,
+    json=_OrjsonJSON,
     ping_timeout=200,       # How long to wait for client pong before disconnecting
     ping_interval=15       # Send a ping every 25 seconds (less than Render's typical 60s timeout)
 )
@@ -37,124 +146,505 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# --- Pydantic Model for validation ---
-class SecretID(BaseModel):
-    """Model to enforce input structure for the secret ID."""
-    secret_id: str
+# Keyed digest of the secret ID. Candidates are hashed the same way and compared in constant
+# time, so neither the comparison time nor the candidate's length says anything about the secret.
+_SECRET_DIGEST = hashlib.blake2b(HARDCODED_SECRET_ID.encode(), key=b"bingo").digest()
+
+def _is_valid_secret(candidate: str) -> bool:
+    digest = hashlib.blake2b(candidate.encode(), key=b"bingo").digest()
+    return hmac.compare_digest(digest, _SECRET_DIGEST)
+
+# --- Session state ---
+async def is_session_started() -> bool:
+    """Whether the master has authorized the session, as seen by every worker."""
+    if redis is not None:
+        return bool(await redis.get(SESSION_KEY))
+    return session_event.is_set()
+
+async def mark_session_started():
+    if redis is not None:
+        await redis.set(SESSION_KEY, "1", ex=SESSION_TTL)
+    else:
+        session_event.set()
+
+# --- Broadcast helper ---
+async def broadcast_batched(event, data, room=None, batch=50):
+    """Emit to everyone in `room` (default: all clients), `batch` clients at a time.
+
+    Yields to the event loop between batches so a draw sent to hundreds of players
+    doesn't hold up HTTP requests queued behind it.
+    """
+    if redis is not None:
+        # Each worker only knows its own clients; let the Redis manager fan out to all of them
+        await sio.emit(event, data, room=room)
+        return
+
+    sids = [sid for sid, _ in sio.manager.get_participants('/', room)]
+    for i in range(0, len(sids), batch):
+        # One emit per batch, so the packet is still encoded once per batch, not per client
+        await sio.emit(event, data, to=sids[i:i + batch])
+        await asyncio.sleep(0)
 
 # --- CORE API ENDPOINTS ---
 
 @app.post("/start_session")
-async def start_session(id_data: SecretID):
+async def start_session(request: Request) -> dict[str, str]:
     """Endpoint to validate the secret ID and start the session."""
-    global session_started
-    
-    if id_data.secret_id == HARDCODED_SECRET_ID:
-        session_started = True
-        print("--- Bingo Session Authorized and Started! ---")
+    # The body is just {"secret_id": "..."}, so check it by hand rather than building a model
+    try:
+        body = orjson.loads(await request.body())
+    except orjson.JSONDecodeError:
+        raise HTTPException(status_code=422, detail="Invalid JSON body.")
+    secret_id = body.get("secret_id") if isinstance(body, dict) else None
+    if not isinstance(secret_id, str) or len(secret_id) > 64:
+        raise HTTPException(status_code=422, detail="Expected {\"secret_id\": string}.")
+
+    if _is_valid_secret(secret_id):
+        await mark_session_started()
+        log.info("--- Bingo Session Authorized and Started! ---")
         # Optional: Emit a session-started event via Socket.IO
-        await sio.emit('session_status', {'status': 'started', 'message': 'Session is now active!'})
+        await broadcast_batched('session_status', {'status': 'started', 'message': 'Session is now active!'})
         return {"message": "Session started successfully!"}
     else:
         # Prevent starting the session if the ID is incorrect
         raise HTTPException(status_code=403, detail="Invalid Secret ID. Authorization Required.")
 
+def _etag(body: bytes) -> str:
+    """Strong ETag for a response body."""
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+def _synth(text: str, lang: str, on_chunk=None) -> bytes:
+    """`_raw_synth`, backed by the on-disk cache. Runs in a worker thread, so file I/O is fine here."""
+    global _disk_clips
+    # The engine is part of the key: Piper and gTTS audio differ, and aren't even the same format
+    engine = PIPER_VOICE or "gtts"
+    digest = hashlib.blake2b(f"{engine}:{lang}:{text}".encode(), digest_size=12).hexdigest()
+    path = TTS_CACHE_DIR / f"{digest}.{'wav' if VOICE is not None else 'mp3'}"
+    try:
+        audio = path.read_bytes()
+    except FileNotFoundError:
+        pass
+    else:
+        # Mark it recently used, so eviction takes the clips nobody asks for any more
+        with contextlib.suppress(OSError):
+            os.utime(path)
+        return audio
+
+    audio = _raw_synth(text, lang, on_chunk)
+    tmp = None
+    try:
+        # Write to a temp file and rename, so other workers never read a half-written clip
+        with tempfile.NamedTemporaryFile(dir=TTS_CACHE_DIR, suffix=".tmp", delete=False) as tmp:
+            tmp.write(audio)
+        os.replace(tmp.name, path)
+    except OSError as e:
+        log.warning("Could not write TTS cache file %s: %s", path, e)
+        if tmp is not None:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp.name)
+    else:
+        _disk_clips += 1
+        if _disk_clips > TTS_CACHE_MAX_FILES:
+            _trim_disk_cache()
+    return audio
+
+def _trim_disk_cache():
+    """Recount the disk cache, evicting the least recently used clips if it is over TTS_CACHE_MAX_FILES."""
+    global _disk_clips
+    try:
+        clips = [e for e in os.scandir(TTS_CACHE_DIR) if e.name.endswith((".mp3", ".wav"))]
+    except OSError:
+        return
+    _disk_clips = len(clips)
+    if len(clips) <= TTS_CACHE_MAX_FILES:
+        return
+    # Go down to 90% of the cap, so the next scan is a few hundred new clips away
+    excess = len(clips) - TTS_CACHE_MAX_FILES * 9 // 10
+    for entry in sorted(clips, key=_mtime)[:excess]:
+        # Another worker may be trimming at the same time
+        with contextlib.suppress(OSError):
+            os.unlink(entry.path)
+    _disk_clips -= excess
+
+def _mtime(entry: os.DirEntry) -> float:
+    try:
+        return entry.stat().st_mtime
+    except OSError:
+        return 0.0
+
+def _raw_synth(text: str, lang: str, on_chunk=None) -> bytes:
+    """Synthesize `text` to audio bytes, handing each chunk to `on_chunk` as soon as it is ready."""
+    if VOICE is not None:
+        # Piper voices are single-language, so `lang` is ignored here
+        wav_fp = io.BytesIO()
+        with wave.open(wav_fp, "wb") as wav_file:
+            VOICE.synthesize_wav(text, wav_file)
+        return wav_fp.getvalue()
+
+    # Otherwise use gTTS (Google Text-to-Speech)
+    tts = gTTS(text=text, lang=lang, tld='us', timeout=TTS_TIMEOUT)
+
+    # Save to memory buffer. gTTS fetches long text in several parts, so pass each on as it arrives.
+    mp3_fp = io.BytesIO()
+    for chunk in tts.stream():
+        mp3_fp.write(chunk)
+        if on_chunk is not None:
+            on_chunk(chunk)
+    return mp3_fp.getvalue()
+
+class _Synthesis:
+    """A `_synth` call running in a worker thread, shared by every request for the same phrase."""
+
+    def __init__(self, text: str, lang: str):
+        loop = asyncio.get_running_loop()
+        self.chunks: list[bytes] = []
+        self.listeners: list[asyncio.Queue] = []
+        on_chunk = lambda chunk: loop.call_soon_threadsafe(self._feed, chunk)
+        self.task = asyncio.ensure_future(asyncio.to_thread(_synth, text, lang, on_chunk))
+        self.task.add_done_callback(self._finish)
+
+    def _feed(self, chunk: bytes):
+        self.chunks.append(chunk)
+        for queue in self.listeners:
+            queue.put_nowait(chunk)
+
+    def _finish(self, _):
+        for queue in self.listeners:
+            queue.put_nowait(None)
+
+    async def stream(self):
+        """Yield the audio produced so far, then follow along until synthesis finishes."""
+        queue = asyncio.Queue()
+        backlog = list(self.chunks)
+        following = not self.task.done()
+        if following:
+            self.listeners.append(queue)
+        try:
+            for chunk in backlog:
+                yield chunk
+            sent = bool(backlog)
+            if following:
+                while (chunk := await queue.get()) is not None:
+                    sent = True
+                    yield chunk
+            # Raises if synthesis failed; engines that don't produce chunks (Piper) deliver it all here
+            audio = await asyncio.shield(self.task)
+            if not sent:
+                yield audio
+        finally:
+            if queue in self.listeners:
+                self.listeners.remove(queue)
+
+def _cache_get(key: tuple[str, str]):
+    """(audio, ETag) for `key`, or None if it has not been synthesized (or was evicted)."""
+    hit = _tts_cache.get(key)
+    if hit is not None:
+        _tts_cache.move_to_end(key)
+    return hit
+
+def _synthesis_done(key: tuple[str, str], task: asyncio.Future):
+    del _inflight[key]
+    if not task.cancelled() and task.exception() is None:
+        # Hash once here, so a cache hit (or a 304) is just a lookup
+        audio = task.result()
+        _tts_cache[key] = (audio, _etag(audio))
+        if len(_tts_cache) > TTS_CACHE_SIZE:
+            _tts_cache.popitem(last=False)
+
+def _start_synthesis(text: str, lang: str) -> _Synthesis:
+    """Join the synthesis already running for this phrase, or start one."""
+    key = (text, lang)
+    job = _inflight.get(key)
+    if job is None:
+        job = _inflight[key] = _Synthesis(text, lang)
+        job.task.add_done_callback(functools.partial(_synthesis_done, key))
+    return job
+
+async def _synth_shared(text: str, lang: str) -> bytes:
+    """Complete audio for `text`, from the cache or from a synthesis shared with concurrent requests."""
+    hit = _cache_get((text, lang))
+    if hit is not None:
+        return hit[0]
+    # Shield so one client going away doesn't cancel the synthesis for everyone else
+    return await asyncio.shield(_start_synthesis(text, lang).task)
+
+def _join_audio(parts: list[bytes]) -> bytes:
+    """Concatenate synthesized clips into one playable file."""
+    if VOICE is None:
+        # MP3 is a sequence of self-contained frames, so clips can simply be appended
+        return b"".join(parts)
+    # WAV has a header with the total length, so rewrite the frames into a single file
+    wav_fp = io.BytesIO()
+    with wave.open(wav_fp, "wb") as joined:
+        for i, part in enumerate(parts):
+            with wave.open(io.BytesIO(part), "rb") as clip:
+                if i == 0:
+                    joined.setparams(clip.getparams())
+                joined.writeframes(clip.readframes(clip.getnframes()))
+    return wav_fp.getvalue()
+
+def _speakable(text: str) -> bool:
+    """Whether `text` is within TTS_MAX_CHARS and has something to say (gTTS fails on empty or
+    punctuation-only text)."""
+    return len(text) <= TTS_MAX_CHARS and any(ch.isalnum() for ch in text)
+
+def _tts_error(e: Exception) -> HTTPException:
+    """The HTTP error to send for a failed synthesis."""
+    if isinstance(e, ValueError):
+        # gTTS rejects unsupported languages up front
+        return HTTPException(status_code=400, detail=str(e))
+    log.error("TTS Error: %s", e)
+    # gTTS wraps the underlying requests error; a timeout is worth retrying sooner
+    if isinstance(e.__context__, requests.exceptions.Timeout):
+        return HTTPException(status_code=504, detail="TTS upstream timed out.", headers={"Retry-After": "2"})
+    return HTTPException(status_code=502, detail="TTS upstream error.", headers={"Retry-After": "2"})
+
 @app.get("/tts")
-async def tts(text: str, lang: str = "en"):
+async def tts(request: Request, text: str, lang: str = "en"):
     """Text-to-Speech service for announcing numbers."""
+    if not _speakable(text):
+        raise HTTPException(status_code=422, detail=f"Expected 1 to {TTS_MAX_CHARS} characters of speakable text.")
+    # Pre-rendered by scripts/prerender_tts.py: send the browser to the static file instead
+    url = AUDIO_MANIFEST.get(text) if lang == "en" else None
+    if url is not None:
+        return RedirectResponse(url, status_code=302)
+
+    hit = _cache_get((text, lang))
+    if hit is None:
+        # Not synthesized yet: stream it out as it is generated so playback can start early.
+        # Wait for the first chunk so a failed synthesis still surfaces as a proper error.
+        chunks = _start_synthesis(text, lang).stream()
+        try:
+            first = await anext(chunks)
+        except (ValueError, gTTSError) as e:
+            raise _tts_error(e)
+
+        async def body():
+            yield first
+            try:
+                async for chunk in chunks:
+                    yield chunk
+            except (ValueError, gTTSError) as e:
+                # Too late for an error status; end the stream and let the client retry
+                log.error("TTS Error mid-stream: %s", e)
+
+        # A later part may still fail, so the browser must not keep a streamed copy
+        return StreamingResponse(body(), media_type=TTS_MEDIA_TYPE, headers={"Cache-Control": "no-store"})
+
+    # The same phrase always yields the same audio, so let the browser keep it forever
+    headers = {"Cache-Control": "public, max-age=31536000, immutable"}
+    audio, headers["ETag"] = hit
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=audio, media_type=TTS_MEDIA_TYPE, headers=headers)
+
+def _read_prerendered(url: str) -> bytes | None:
+    try:
+        return (INDEX_PATH.parent / url.lstrip("/")).read_bytes()
+    except FileNotFoundError:
+        return None
+
+async def _batch_part(text: str, lang: str) -> bytes:
+    """One phrase of a batch: the pre-rendered MP3 if there is one, else synthesized."""
+    # Pre-rendered files are MP3, so they can only be joined with gTTS output
+    url = AUDIO_MANIFEST.get(text) if lang == "en" and VOICE is None else None
+    if url is not None:
+        audio = await asyncio.to_thread(_read_prerendered, url)
+        if audio is not None:
+            return audio
+    return await _synth_shared(text, lang)
+
+@app.post("/tts_batch")
+async def tts_batch(request: Request):
+    """Several phrases (e.g. "Next is", "42!") as one audio file, so a call-out is a single request."""
     try:
-        # Generate TTS using gTTS (Google Text-to-Speech)
-        tts = gTTS(text=text, lang='en', tld='us')
-        
-        # Save to memory buffer
-        mp3_fp = io.BytesIO()
-        tts.write_to_fp(mp3_fp)
-        mp3_fp.seek(0)
-        
-        return StreamingResponse(mp3_fp, media_type="audio/mpeg")
-    except Exception as e:
-        print(f"TTS Error: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+        body = orjson.loads(await request.body())
+    except orjson.JSONDecodeError:
+        raise HTTPException(status_code=422, detail="Invalid JSON body.")
+    phrases = body.get("phrases") if isinstance(body, dict) else None
+    lang = body.get("lang", "en") if isinstance(body, dict) else None
+    if (not isinstance(phrases, list) or not 0 < len(phrases) <= 20 or not isinstance(lang, str)
+            or not all(isinstance(p, str) and _speakable(p) for p in phrases)):
+        raise HTTPException(status_code=422, detail="Expected {\"phrases\": [string, ...]}.")
 
+    # Each phrase goes through the per-phrase cache, so common fragments are synthesized once
+    try:
+        parts = await asyncio.gather(*(_batch_part(text, lang) for text in phrases))
+    except (ValueError, gTTSError) as e:
+        raise _tts_error(e)
+
+    return Response(content=_join_audio(parts), media_type=TTS_MEDIA_TYPE)
 
 # --- Socket.IO Events (No Change) ---
 # ... (sio event handlers here) ...
 @sio.event
-async def connect(sid, environ):
+async def connect(sid, environ, auth=None):
     """Handle client connections."""
-    print(f"Client connected: {sid}")
+    log.info("Client connected: %s", sid)
+    # Players identify themselves so draws are only fanned out to them, not to masters
+    if isinstance(auth, dict) and auth.get('role') == 'player':
+        await sio.enter_room(sid, 'players')
     # Inform the new client about the current session status
-    await sio.emit('session_status', {'status': 'started' if session_started else 'pending', 'message': 'Session status update.'}, room=sid)
+    await sio.emit('session_status', {'status': 'started' if await is_session_started() else 'pending', 'message': 'Session status update.'}, room=sid)
 
 @sio.event
 async def disconnect(sid):
     """Handle client disconnections."""
-    print(f"Client disconnected: {sid}")
+    log.info("Client disconnected: %s", sid)
 
 @sio.event
 async def player_win(sid, data):
     """Handle a player claiming Bingo (Win)."""
     # Authorization Check
-    if not session_started:
-        print(f"Win attempt rejected: Session not started.")
+    if not await is_session_started():
+        log.warning("Win attempt rejected: Session not started.")
         # Optionally send an error back to the player
         await sio.emit('error', {'message': 'Game has not started yet. Session ID required.'}, room=sid)
         return
 
     # data should be { 'name': 'PlayerName', 'type': 'row' | 'diagonal' | 'full' }
-    print(f"Win detected: {data}")
+    log.info("Win detected: %s", data)
     # Broadcast to all clients (specifically Master will listen)
-    await sio.emit('bingo_win', data)
+    await broadcast_batched('bingo_win', data)
 
 @sio.event
 async def master_draw(sid, data):
     """Handle the master drawing a number."""
     # Authorization Check
-    if not session_started:
-        print(f"Number draw rejected: Session not started.")
+    if not await is_session_started():
+        log.warning("Number draw rejected: Session not started.")
         # Optionally send an error back to the master
         await sio.emit('error', {'message': 'Game has not started yet. Session ID required.'}, room=sid)
         return
 
     # data should be { 'number': 42 }
-    print(f"Number drawn: {data}")
+    log.info("Number drawn: %s", data)
     # Broadcast to all players
-    await sio.emit('number_drawn', data)
+    await broadcast_batched('number_drawn', data, room='players')
 
 
 # ... (All API routes and Socket.IO events are defined above) ...
 
 # --- FRONTEND SERVING LOGIC (MUST BE AT THE END) ---
 
-# 1. Mount the 'assets' folder specifically for JS/CSS files generated by Vite
-# This is clean and handles all /assets/ requests (JS/CSS).
-app.mount("/assets", StaticFiles(directory="frontend/dist/assets"), name="assets")
+# 1. Serve every file in 'frontend/dist' (Vite's /assets/ JS/CSS plus root files like vite.svg)
+# straight from ServeStatic, which indexes them once at startup and picks the precompressed
+# .br/.gz variant that `npm run build` writes next to each file (indexed in `lifespan`).
+# Vite content-hashes everything under /assets/, and pre-rendered /audio/ MP3s are named after a
+# hash of their audio, so those can be cached forever.
+# Lookups are a dict hit per request, and ServeStatic answers If-None-Match with a bodiless 304.
+socket_app = ServeStaticASGI(
+    socket_app,
+    immutable_file_test=r"^/assets/|^/audio/.+\.mp3$",
+    autorefresh=False,
+)
+
+# 2. Keep index.html in memory. It only changes on deploy; send SIGHUP to pick up a new build.
+INDEX_PATH = pathlib.Path("frontend/dist/index.html")
+INDEX_HTML = None
+INDEX_ETAG = None
+# Precompressed index.html.br / .gz written by the postbuild step: encoding -> (body, ETag)
+INDEX_ENCODED: dict[str, tuple[bytes, str]] = {}
+# Phrase -> URL of its pre-rendered MP3, from scripts/prerender_tts.py
+AUDIO_MANIFEST_PATH = pathlib.Path("frontend/dist/audio/manifest.json")
+AUDIO_MANIFEST: dict[str, str] = {}
+# Subdirectories of dist (e.g. "assets/"). Paths under them are files, never client-side routes.
+STATIC_PREFIXES = ()
 
-# 2. Handle the root path (/).
+def _load_index():
+    """(Re)read index.html, its compressed variants and their ETags. None if the frontend isn't built."""
+    global INDEX_HTML, INDEX_ETAG, INDEX_ENCODED
+    try:
+        html = INDEX_PATH.read_bytes()
+    except FileNotFoundError:
+        INDEX_HTML = INDEX_ETAG = None
+        INDEX_ENCODED = {}
+        return
+    encoded = {}
+    for encoding, suffix in (("br", ".br"), ("gzip", ".gz")):
+        variant = INDEX_PATH.with_name(INDEX_PATH.name + suffix)
+        if variant.is_file():
+            body = variant.read_bytes()
+            encoded[encoding] = (body, _etag(body))
+    INDEX_HTML, INDEX_ETAG, INDEX_ENCODED = html, _etag(html), encoded
+
+def _load_audio_manifest():
+    global AUDIO_MANIFEST
+    try:
+        AUDIO_MANIFEST = json.loads(AUDIO_MANIFEST_PATH.read_bytes())
+    except FileNotFoundError:
+        AUDIO_MANIFEST = {}
+
+def _load_static_prefixes():
+    global STATIC_PREFIXES
+    dist = INDEX_PATH.parent
+    STATIC_PREFIXES = tuple(p.name + "/" for p in dist.iterdir() if p.is_dir()) if dist.is_dir() else ()
+
+def _reload_frontend(*_):
+    """Load the built frontend. Also the SIGHUP handler, to pick up a fresh `npm run build`."""
+    # (Re-)index dist so the new hashed bundles resolve (old ones stay servable for open tabs)
+    socket_app.add_files("frontend/dist")
+    _load_static_prefixes()
+    _load_audio_manifest()
+    _load_index()
+
+def _accepted_encodings(header: str) -> set[str]:
+    """Codings an Accept-Encoding header allows; `q=0` means the client refuses that coding."""
+    accepted = set()
+    for item in header.split(","):
+        coding, *params = (part.strip() for part in item.split(";"))
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding and q > 0:
+            accepted.add(coding.lower())
+    return accepted
+
+def _index_response(request: Request) -> Response:
+    """index.html from memory, or 304 if the browser already has this build."""
+    if INDEX_HTML is None:
+        raise HTTPException(status_code=404, detail="Frontend not built.")
+    body, etag = INDEX_HTML, INDEX_ETAG
+    # no-cache: always revalidate, so a new deploy is picked up on the next load
+    headers = {"Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+
+    # Prefer the smallest precompressed variant the browser accepts
+    accepted = _accepted_encodings(request.headers.get("accept-encoding", ""))
+    for encoding in ("br", "gzip"):
+        if encoding in accepted and encoding in INDEX_ENCODED:
+            body, etag = INDEX_ENCODED[encoding]
+            headers["Content-Encoding"] = encoding
+            break
+
+    headers["ETag"] = etag
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="text/html", headers=headers)
+
+# 3. Handle the root path (/).
 @app.get("/")
-async def root():
+async def root(request: Request):
     """Serves the main index.html file for the frontend."""
-    return FileResponse("frontend/dist/index.html", media_type="text/html")
+    return _index_response(request)
 
-# 3. SPA Fallback (The combined catch-all for /player AND root assets like vite.svg)
+# 4. SPA Fallback (The catch-all for client-side routes like /player)
 @app.get("/{full_path:path}")
-async def serve_frontend_routes(full_path: str):
+async def serve_frontend_routes(request: Request, full_path: str):
     """
-    Catch-all route:
-    - If it looks like a static file (e.g., vite.svg), try to serve it.
-    - Otherwise (e.g., /player), serve index.html for React Router.
+    Catch-all route: physical files were already served by ServeStatic, so anything
+    reaching here (e.g., /player) gets index.html for React Router.
     """
-    file_path = os.path.join("frontend/dist", full_path)
-    
-    # Check if a physical file exists at the root of 'dist' (e.g., vite.svg, favicon.ico)
-    if os.path.exists(file_path) and not os.path.isdir(file_path):
-        # We only serve files that are not handled by the /assets/ mount
-        if not full_path.startswith("assets/"):
-            return FileResponse(file_path)
+    # A missing bundle file is a real 404, not a client-side route
+    if full_path.startswith(STATIC_PREFIXES):
+        raise HTTPException(status_code=404, detail="Not Found")
 
-    # If the path doesn't correspond to a physical file (e.g., /player, or /invalid-api-call)
-    # serve the index.html for client-side routing.
-    return FileResponse("frontend/dist/index.html", media_type="text/html")
+    return _index_response(request)
 
 if __name__ == "__main__":
     import uvicorn
@@ -162,5 +652,21 @@ if __name__ == "__main__":
     # Default to 0.0.0.0 and 8000 if variables are not set (e.g., for local testing)
     port = int(os.environ.get("PORT", 8000))
     host = os.environ.get("HOST", "0.0.0.0")
+    # uvloop + httptools (from uvicorn[standard]) are much faster than asyncio + h11.
+    # uvloop doesn't support Windows. Access logs stay off the hot path.
+    server_options = dict(
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        log_level="warning",
+    )
     
-    uvicorn.run(socket_app, host=host, port=port)
+    if REDIS_URL:
+        # Workers coordinate through Redis, so use every core. Clients are websocket-only,
+        # so no sticky sessions are needed. Workers re-import this file as `main`.
+        workers = int(os.environ.get("WEB_CONCURRENCY", 4))
+        # A (re)start puts the session back to pending, as it does without Redis
+        from redis import Redis
+        Redis.from_url(REDIS_URL).delete(SESSION_KEY)
+        uvicorn.run("main:socket_app", host=host, port=port, workers=workers, **server_options)
+    else:
+        uvicorn.run(socket_app, host=host, port=port, **server_options)
@@ -27,7 +27,8 @@ const Player = () => {
         // Connect to socket
         socketRef.current = io(API_URL, {
             transports: ['websocket'], // Force WebSocket protocol
-            upgrade: false             // Prevents the initial polling attempt
+            upgrade: false,            // Prevents the initial polling attempt
+            auth: { role: 'player' }   // Joins the room that number draws are sent to
         });
 
         socketRef.current.on('number_drawn', (data) => {
@@ -0,0 +1,60 @@
+"""Pre-render every phrase the Master screen announces into frontend/public/audio.
+
+Bingo has a closed vocabulary, so the audio can be made once per deploy instead of
+synthesized at runtime. Run before `npm run build`, which copies public/ into dist:
+
+    python scripts/prerender_tts.py
+
+Files are named after a hash of their audio, so the server can cache them forever.
+`audio/manifest.json` maps each phrase to its file; /tts redirects there on a hit.
+Phrases already in the manifest are skipped, so re-running only fetches new ones.
+"""
+from gtts import gTTS
+import hashlib
+import io
+import json
+import pathlib
+import sys
+
+# Keep in sync with `phrases` and `getBingoCall` in frontend/src/pages/Master.jsx
+PREFIXES = ["Next is", "Coming up", "Ready for", "We have", "Look for", "Here is", ""]
+CALLS = {
+    1: "Kelly's Eye",
+    11: "Legs Eleven",
+    22: "Two Little Ducks",
+    66: "Clickety Click",
+    90: "Top of the Shop",
+}
+
+def bingo_call(num: int) -> str:
+    return f"{num}, {CALLS[num]}!" if num in CALLS else f"{num}!"
+
+def vocabulary():
+    """Every text the Master can announce: each number, with and without a prefix."""
+    for num in range(1, 91):
+        call = bingo_call(num)
+        for prefix in PREFIXES:
+            yield f"{prefix} {call}" if prefix else call
+
+def main(public: pathlib.Path):
+    audio_dir = public / "audio"
+    audio_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = audio_dir / "manifest.json"
+    manifest = json.loads(manifest_path.read_text()) if manifest_path.exists() else {}
+
+    for text in vocabulary():
+        url = manifest.get(text)
+        if url and (public / url.lstrip("/")).exists():
+            continue
+        mp3_fp = io.BytesIO()
+        gTTS(text=text, lang='en', tld='us').write_to_fp(mp3_fp)
+        mp3 = mp3_fp.getvalue()
+        name = f"{hashlib.blake2b(mp3, digest_size=8).hexdigest()}.mp3"
+        (audio_dir / name).write_bytes(mp3)
+        manifest[text] = f"/audio/{name}"
+        # Save as we go so an interrupted run keeps what it already fetched
+        manifest_path.write_text(json.dumps(manifest, indent=2))
+        print(f"{text!r} -> {name}")
+
+if __name__ == "__main__":
+    main(pathlib.Path(sys.argv[1] if len(sys.argv) > 1 else "frontend/public"))